@@ -1,20 +1,40 @@
 import json
+import os
 import urllib3
 
 def load_version():
   package = json.load(open("package.json"))
   return package.get("name") + " v" + package.get("version")
 
+# Already parsed configs, by path, along with the file mtime or ETag they were read with
+_configs_cache = {}
+
+# Read configuration file, unless it hasn't changed since last time it was read
+def read_config(path):
+  cached = _configs_cache.get(path)
+  if path.startswith("http"):
+    headers = {}
+    if cached is not None and cached[0] is not None:
+      headers["If-None-Match"] = cached[0]
+    http = urllib3.PoolManager(timeout=3.0)
+    response = http.request('GET', path, headers=headers)
+    if response.status == 304:
+      return cached[1]
+    version = response.headers.get("ETag")
+    config = json.loads(response.data.decode('utf-8'))
+  else:
+    version = os.stat(path).st_mtime_ns
+    if cached is not None and cached[0] == version:
+      return cached[1]
+    config = json.load(open(path))
+  _configs_cache[path] = (version, config)
+  return config
+
 # Load price feeds configuration parameters from file
 def load_price_feeds_config(path, network_name):
   chain_name = network_name.split('.')[0]
   try:
-    if path.startswith("http"):
-      http = urllib3.PoolManager(timeout=3.0)
-      response = http.request('GET', path)
-      config = json.loads(response.data.decode('utf-8'))
-    else:
-      config = json.load(open(path))
+    config = read_config(path)
   except Exception as ex:
     print(f"Fatal exception when trying to read triggering conditions from {path}:\n=> {ex}")
     exit(1)
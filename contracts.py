@@ -13,3 +13,10 @@ def wpf_contract(w3, addr):
     wpf_abi = json.load(json_file)  
     contract = w3.eth.contract(addr, abi=wpf_abi)
   return contract
+
+# Return the Multicall3 contract, given an address
+def multicall3_contract(w3, addr):
+  with open("abis/Multicall3.json") as json_file:
+    multicall3_abi = json.load(json_file)
+    contract = w3.eth.contract(addr, abi=multicall3_abi)
+  return contract
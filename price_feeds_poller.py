@@ -1,24 +1,44 @@
 #!/usr/bin/env python3
 import argparse
-import contextlib
 import datetime
 import os
+import queue
+import re
+import requests
+import shutil
 import subprocess
 import sys
+import threading
 import time
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from configs import load_price_feeds_config, load_version
-from contracts import wpr_contract, wpf_contract
+from contracts import multicall3_contract, wpr_contract, wpf_contract
 from dotenv import load_dotenv
-from io import StringIO
+from eth_utils import encode_hex, function_abi_to_4byte_selector
+from hexbytes import HexBytes
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3, exceptions
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3._utils.request import make_post_request
+from web3.gas_strategies.rpc import rpc_gas_price_strategy
 from web3.logs import DISCARD
 from web3.middleware import geth_poa_middleware
 
+# Write down all pending log lines at once
+def flush_lines(lines):
+  if len(lines) > 0:
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    lines.clear()
+
 # Post a data request to the post_dr method of the WRB contract
 def handle_requestUpdate(
     w3,
-    csv_filename,
+    csv_queue,
     router,
     contract,
     isRouted,
@@ -28,37 +48,61 @@ def handle_requestUpdate(
     web3_gas,
     web3_gas_price,
     web3_provider_waiting_secs,
-    web3_provider_polling_secs
+    web3_provider_polling_secs,
+    last_tx,
+    out
   ):
 
     try:
-      print(f" - Price feed    : {contract.address}")
-      print(f" - Price router  : {router.address}")      
+      out.append(f" - Price feed    : {contract.address}")
+      out.append(f" - Price router  : {router.address}")      
+
+      # Read contract info, master balance and either gas price or update fee, at once
+      rpc_gas_price = web3_gas_price is None and w3.eth.gasPriceStrategy is rpc_gas_price_strategy
       if isRouted == False:
-        print(f" - Witnet address: {contract.functions.witnet().call()}")
-        print(f" - Request hash  : {contract.functions.hash().call().hex()}")
+        reads = [ (contract, "witnet", None), (contract, "hash", None) ]
       else:
-        print(f" - Routed pairs  : ({contract.functions.getPairsCount().call()})")
+        reads = [ (contract, "getPairsCount", None) ]
+      reads.append((None, "eth_getBalance", [ web3_from, "latest" ]))
+      if web3_gas_price is not None:
+        reads.append((contract, "estimateUpdateFee", [ web3_gas_price ]))
+      elif rpc_gas_price:
+        reads.append((None, "eth_gasPrice", None))
+      results = check_results(batch_rpc(w3, reads))
+
+      if isRouted == False:
+        out.append(f" - Witnet address: {results[0]}")
+        out.append(f" - Request hash  : {results[1].hex()}")
+      else:
+        out.append(f" - Routed pairs  : ({results[0]})")
 
       # Check that the account has enough balance
-      balance = w3.eth.getBalance(web3_from)
+      balance = Web3.toInt(hexstr=results[2 if isRouted == False else 1])
       if balance == 0:
           raise Exception("Master account run out of funds")
+      log_settled_fee(settle_last_fee(last_tx, balance), web3_symbol, out)
 
-      print(f" - Account       : {web3_from}")        
-      print(f" - Balance       : {round(balance / 10 ** 18, 5)} {web3_symbol}")
+      out.append(f" - Account       : {web3_from}")        
+      out.append(f" - Balance       : {round(balance / 10 ** 18, 5)} {web3_symbol}")
 
       # Apply gas price strategy, if any
+      fee = None
       if web3_gas_price is None:
-        web3_gas_price = w3.eth.generateGasPrice()
-      print( " - Tx. gas price :", "{:,}".format(web3_gas_price))     
+        if rpc_gas_price:
+          web3_gas_price = Web3.toInt(hexstr=results[-1])
+        else:
+          web3_gas_price = w3.eth.generateGasPrice()
+      else:
+        fee = results[-1]
+      out.append(f" - Tx. gas price : {'{:,}'.format(web3_gas_price)}")     
       
       if web3_gas is not None:
-        print( " - Tx. gas limit :", "{:,}".format(web3_gas))
+        out.append(f" - Tx. gas limit : {'{:,}'.format(web3_gas)}")
 
-      # Estimate evm+witnet fee
-      fee = contract.functions.estimateUpdateFee(web3_gas_price).call()
-      print(f" - Tx. value     : {round(fee / 10 ** 18, 5)} {web3_symbol}")
+      # Estimate evm+witnet fee, if not yet known
+      if fee is None:
+        fee = raw_call(w3, contract, "estimateUpdateFee", [ web3_gas_price ])
+      out.append(f" - Tx. value     : {round(fee / 10 ** 18, 5)} {web3_symbol}")
 
       # Send Web3 transaction ..
       if web3_gas is None:
@@ -78,31 +122,39 @@ def handle_requestUpdate(
         })
 
       # Log send transaction attempt
-      log_master_balance(csv_filename, web3_from, balance, tx.hex())
-      print(f" ~ Tx. hash      : {tx.hex()}")      
+      log_master_balance(csv_queue, web3_from, balance, tx.hex())
+      out.append(f" ~ Tx. hash      : {tx.hex()}")      
 
       # Wait for tx receipt and print relevant tx info upon reception
-      receipt = w3.eth.wait_for_transaction_receipt(
-        tx,
-        web3_provider_waiting_secs,
-        web3_provider_polling_secs
-      )
-      total_fee = balance - w3.eth.getBalance(web3_from)
-      print( " > Tx. block num.:", "{:,}".format(receipt.get("blockNumber")))
-      print( " > Tx. total gas :", "{:,}".format(receipt.get("gasUsed")))
-      print( " > Tx. total fee :", round(total_fee / 10 ** 18, 5), web3_symbol)
+      try:
+        receipt = w3.eth.wait_for_transaction_receipt(
+          tx,
+          web3_provider_waiting_secs,
+          web3_provider_polling_secs
+        )
+      except exceptions.TimeExhausted as ex:
+        # check once more, as the tx could have been mined right after last poll
+        try:
+          receipt = w3.eth.get_transaction_receipt(tx)
+        except exceptions.TransactionNotFound:
+          raise ex
+      # Upper bound, as part of the tx value may have been refunded: see `settle_last_fee`
+      total_fee = fee + receipt.get("gasUsed") * (receipt.get("effectiveGasPrice") or web3_gas_price)
+      out.append(f" > Tx. block num.: {'{:,}'.format(receipt.get('blockNumber'))}")
+      out.append(f" > Tx. total gas : {'{:,}'.format(receipt.get('gasUsed'))}")
+      out.append(f" > Tx. max fee   : {round(total_fee / 10 ** 18, 5)} {web3_symbol}")
 
     except exceptions.TimeExhausted:
-      print(f"   ** Transaction is taking too long !!")
+      out.append(f"   ** Transaction is taking too long !!")
       return [ 0 ]
 
     except Exception as ex:
-      print(f"   xx Transaction rejected: {ex}")
+      out.append(f"   xx Transaction rejected: {ex}")
       return [ 0 ]
 
     # Check if transaction was succesful
     if receipt['status'] == False:
-      print(f"   $$ Transaction reverted !!")
+      out.append(f"   $$ Transaction reverted !!")
       return [ -1, tx.hex() ]
     else:
       requestId = 0
@@ -110,65 +162,234 @@ def handle_requestUpdate(
       if len(logs) > 0:        
         requestId = logs[0].args.queryId
         if requestId > 0:
-          print(f" <<<< Request id : {requestId}")
+          out.append(f" <<<< Request id : {requestId}")
         else:
-          print(f" <<<< Synchronous update.")
-        return [ requestId, tx.hex(), total_fee ]
+          out.append(f" <<<< Synchronous update.")
+        return [ requestId, tx.hex(), total_fee, balance ]
       else:
-        print(f" ==== Previous request id : {latestRequestId} (nothing to update)")
-        return [ latestRequestId, tx.hex(), total_fee ]
+        out.append(f" ==== Previous request id : {latestRequestId} (nothing to update)")
+        return [ latestRequestId, tx.hex(), total_fee, balance ]
+
+def log_master_balance(csv_queue, addr, balance, txhash):
+  if csv_queue is not None:
+    csv_queue.put_nowait((int(time.time()), addr, balance, txhash))
 
-def log_master_balance(csv_filename, addr, balance, txhash):
-  if csv_filename is not None:
+# Open the CSV file once, and append logged rows from a background thread
+def start_csv_writer(csv_filename):
+  try:
+    csv_file = open(csv_filename, "a", encoding="utf-8", buffering=8192)
+  except Exception as ex:
+    print(f"Cannot open CSV file {csv_filename}: {ex}")
+    return None
+  csv_queue = queue.Queue()
+  threading.Thread(target=drain_csv_rows, args=(csv_file, csv_queue), daemon=True).start()
+  return csv_queue
+
+def drain_csv_rows(csv_file, csv_queue):
+  csv_name = os.path.splitext(os.path.basename(csv_file.name))[0]
+  while True:
+    # wait for next row, and take along any other already queued, up to 64
+    records = [ csv_queue.get() ]
+    while len(records) < 64 and not csv_queue.empty():
+      records.append(csv_queue.get_nowait())
     try:
-      with open(csv_filename, "a", encoding="utf-8") as csv_file:
-        readable_ts = datetime.datetime.fromtimestamp(int(time.time())).strftime('%Y-%m-%d %H:%M:%S %Z')
-        row = f"\"{os.path.splitext(os.path.basename(csv_filename))[0]}\";\"{addr}\";\"{readable_ts}\";\"{balance}\";\"{txhash}\""
+      for ts, addr, balance, txhash in records:
+        readable_ts = time.strftime('%Y-%m-%d %H:%M:%S %Z', time.localtime(ts))
+        row = f"\"{csv_name}\";\"{addr}\";\"{readable_ts}\";\"{balance}\";\"{txhash}\""
         csv_file.write(row + '\n')
+      csv_file.flush()
     except Exception as ex:
-      return
+      continue
 
-def log_exception_state(addr, reason):
-  # log the error and wait 1 second before next iteration
-  print(f"Exception while getting state from contract {addr}:\n{reason}")
-  time.sleep(1)
-
-@contextlib.contextmanager
-def stdoutIO(stdout=None):
-  old = sys.stdout
-  if stdout is None:
-    stdout = StringIO()
-  sys.stdout = stdout
-  yield stdout
-  sys.stdout = old
-
-def dry_run_request(bytecode, timeout_secs):
-  cmdline = "npx witnet-toolkit try-data-request --hex "
-  cmdline += bytecode.hex()
-  cmdline += " | tail -n 2 | head -n 1 | awk -F: '{ print $2 }' | sed 's/ //g' | tr -d \"│\""
-  
-  # Dry-run result needs to be fetched from temporary file, 
-  # because of https://bugs.python.org/issue30154.
-  with open("tmp.out", "w+") as output:
-    process = subprocess.Popen(
-      cmdline,
-      stdout = output,
-      shell = True,
+# Extracts the numeric value out of a `witnet-toolkit try-data-request` result line
+DRY_RUN_RESULT_RE = re.compile(rb'^[^:]*:\s*([-\d]+)', re.M)
+
+# Resolve the witnet-toolkit launcher once, so dry-runs don't need to go through npx every time
+def witnet_toolkit_cmdline():
+  toolkit = shutil.which("witnet-toolkit", path=os.path.join("node_modules", ".bin"))
+  if toolkit is not None:
+    return [ os.path.abspath(toolkit) ]
+  else:
+    return [ "npx", "witnet-toolkit" ]
+
+def dry_run_request(toolkit, bytecode, timeout_secs):
+  try:
+    process = subprocess.run(
+      toolkit + [ "try-data-request", "--hex", bytecode.hex() ],
+      capture_output = True,
+      timeout = timeout_secs,
+      check = True
     )
-    process.wait(timeout=timeout_secs)
+  except subprocess.TimeoutExpired:
+    raise Exception(f"Timeout while trying data request ({timeout_secs} secs)")
+
+  # Dry-run result is to be found in the second to last line of the output
+  lines = process.stdout.splitlines()
+  match = DRY_RUN_RESULT_RE.search(lines[-2]) if len(lines) >= 2 else None
+  if match is None:
+    raise Exception(f"Unexpected output while trying data request: {process.stdout[-256:]}")
+  return int(match.group(1))
+
+# Endpoints known to reject JSON-RPC batch requests
+_batch_unsupported = set()
+
+# Don't try batch requests on current endpoint again
+def disable_batch_rpc(w3, reason):
+  print(f"Disabling JSON-RPC batch requests on {w3.provider.endpoint_uri}: {reason}")
+  _batch_unsupported.add(w3.provider.endpoint_uri)
+
+# Pack several contract calls, or raw RPC methods if no contract is given, into as few
+# JSON-RPC batch requests as possible. Failing calls are returned as exceptions, in place.
+def batch_rpc(w3, calls, batch_size=20):
+  results = []
+  for offset in range(0, len(calls), batch_size):
+    chunk = calls[offset:offset + batch_size]
+    methods = []
+    for contract, fn_name, args in chunk:
+      if contract is None:
+        methods.append((fn_name, args or []))
+      else:
+        methods.append(("eth_call", [{
+          "to": contract.address,
+          "data": encode_function_call(contract, fn_name, args)
+        }, "latest"]))
+    responses = None
+    if w3.provider.endpoint_uri not in _batch_unsupported:
+      try:
+        raw_response = make_post_request(
+          w3.provider.endpoint_uri,
+          b'[' + b','.join([ w3.provider.encode_rpc_request(method, params) for method, params in methods ]) + b']',
+          **w3.provider.get_request_kwargs()
+        )
+        responses = w3.provider.decode_rpc_response(raw_response)
+      except requests.exceptions.HTTPError as ex:
+        # Batch requests refused by the provider, rather than some transient failure (e.g. 429, 5xx)
+        if ex.response is not None and ex.response.status_code in (400, 405, 413):
+          disable_batch_rpc(w3, f"HTTP {ex.response.status_code}")
+      if isinstance(responses, list) and len(responses) == len(chunk):
+        # Responses may come in any order, but request ids are always increasing
+        responses = sorted(responses, key=lambda response: response["id"])
+      else:
+        if isinstance(responses, dict):
+          # Batch answered as a single call, most likely with a "batch not supported" error
+          disable_batch_rpc(w3, responses.get("error", responses))
+        responses = None
+    if responses is None:
+      responses = [ w3.provider.make_request(method, params) for method, params in methods ]
+    for (contract, fn_name, args), response in zip(chunk, responses):
+      if "error" in response:
+        results.append(Exception(response["error"].get("message")))
+      elif contract is None:
+        results.append(response["result"])
+      else:
+        try:
+          results.append(decode_function_result(w3, contract, fn_name, response["result"]))
+        except Exception as ex:
+          results.append(ex)
+  return results
+
+# Aggregate several contract calls into one single eth_call to a Multicall3 contract.
+# Failing calls are returned as exceptions, in place.
+def multicall_rpc(w3, multicall, calls):
+  responses = multicall.functions.aggregate3([
+    (contract.address, True, encode_function_call(contract, fn_name, args))
+      for contract, fn_name, args in calls
+  ]).call()
+  results = []
+  for (contract, fn_name, args), (success, data) in zip(calls, responses):
+    if success:
+      try:
+        results.append(decode_function_result(w3, contract, fn_name, data))
+      except Exception as ex:
+        results.append(ex)
+    else:
+      results.append(Exception(f"{fn_name}() reverted on {contract.address}"))
+  return results
+
+# Read-only call to some contract function, skipping web3's contract call machinery
+def raw_call(w3, contract, fn_name, args=None):
+  data = w3.manager.request_blocking("eth_call", [{
+    "to": contract.address,
+    "data": encode_function_call(contract, fn_name, args)
+  }, "latest"])
+  return decode_function_result(w3, contract, fn_name, data)
+
+# Selectors and output types of already called contract functions
+_function_abis = {}
+
+def function_abi(contract, fn_name):
+  key = (contract.address, fn_name)
+  if key not in _function_abis:
+    fn_abi = contract.get_function_by_name(fn_name).abi
+    _function_abis[key] = (
+      encode_hex(function_abi_to_4byte_selector(fn_abi)),
+      get_abi_output_types(fn_abi)
+    )
+  return _function_abis[key]
+
+def encode_function_call(contract, fn_name, args):
+  if args:
+    return contract.encodeABI(fn_name, args)
+  else:
+    selector, _ = function_abi(contract, fn_name)
+    return selector
 
-  with open("tmp.out", "r") as output:
-    if os.stat("tmp.out").st_size == 0:
-      raise Exception(f"Timeout while trying data request ({timeout_secs} secs)")
-    return int(output.read())
+def decode_function_result(w3, contract, fn_name, data):
+  _, output_types = function_abi(contract, fn_name)
+  output_data = w3.codec.decode_abi(output_types, HexBytes(data))
+  normalized_data = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, output_data)
+  if len(normalized_data) == 1:
+    return normalized_data[0]
+  else:
+    return normalized_data
+
+# Raise first exception found within batched results, if any
+def check_results(results):
+  for result in results:
+    if isinstance(result, Exception):
+      raise result
+  return results
+
+# Append value to some price feed history, while keeping track of its running total
+def push_history(pf, key, value):
+  if len(pf[key]) == pf[key].maxlen:
+    # oldest value is about to be evicted
+    pf[key + "_total"] -= pf[key][0]
+  pf[key].append(value)
+  pf[key + "_total"] += value
+
+# Replace latest value in some price feed history
+def amend_history(pf, key, value):
+  pf[key + "_total"] += value - pf[key][-1]
+  pf[key][-1] = value
+
+def clear_history(pf, key):
+  pf[key].clear()
+  pf[key + "_total"] = 0
+
+# Refunds of unused tx value can only be noticed from the master balance, once read again
+# after the transaction. If less than expected was spent, amend the fee history accordingly,
+# and return the amended price feed. As a trade-off, transfers to the master account landing
+# in between may make the settled fee lower than it actually was.
+def settle_last_fee(last_tx, balance):
+  pf = last_tx.pop("pf", None)
+  if pf is not None and len(pf["fees"]) > 0 and pf["fees"][-1] == last_tx["fee"]:
+    spent = last_tx["balance"] - balance
+    if 0 < spent < last_tx["fee"]:
+      amend_history(pf, "fees", spent)
+      return pf
+  return None
+
+def log_settled_fee(pf, web3_symbol, out):
+  if pf is not None:
+    out.append(f"Settled fee of last {pf['caption']} update: {round(pf['fees'][-1] / 10 ** 18, 5)} {web3_symbol}")
 
 def avg_fees(pfs):
   total_fees = 0
   total_records = 0
   for pf in pfs:
-    if len(pf["fees"]) > 0:
-      total_fees += sum(pf["fees"])
-      total_records += len(pf["fees"])
+    total_fees += pf["fees_total"]
+    total_records += len(pf["fees"])
   if total_records > 0:
     return total_fees / total_records
   else:
@@ -179,12 +400,12 @@ def time_to_die_secs(balance, pfs):
   total_avg_fee = avg_fees(pfs)
   for pf in pfs:
     if len(pf["secs"]) > 0:
-      pf_secs = sum(pf["secs"]) / len(pf["secs"])
+      pf_secs = pf["secs_total"] / len(pf["secs"])
     else:
       pf_secs = pf["heartbeat"]    
     if pf_secs > 0:
       if len(pf["fees"]) > 0:    
-        pf_fee = sum(pf["fees"]) / len(pf["fees"])
+        pf_fee = pf["fees_total"] / len(pf["fees"])
       else:
         pf_fee = total_avg_fee
       total_speed += (pf_fee / pf_secs)
@@ -193,10 +414,325 @@ def time_to_die_secs(balance, pfs):
   else:
     return 0
 
+# Copy triggering conditions and display settings of some price feed from its configuration
+def apply_feed_config(pf, feed_config):
+  pf["cooldown"] = int(feed_config.get("minSecsBetweenUpdates", 0))
+  pf["deviation"] = feed_config.get("deviationPercentage", 0.0)
+  pf["heartbeat"] = int(feed_config.get("maxSecsBetweenUpdates", 0))
+  pf["isRouted"] = feed_config.get("isRouted", False)
+  pf["label"] = feed_config.get("label", "")
+
+# Read current state of some price feed, as routed by the router, returning also log lines
+def probe_feed(w3, pfs_router, feed_config, caption):
+  pf = None
+  lines = []
+  erc2362id = pfs_router.functions.currencyPairId(caption).call().hex()
+  lines.append(f"{caption}:")
+  for attempt in range(5):
+    try:
+      addr = pfs_router.functions.getPriceFeed(erc2362id).call()
+      if addr == "0x0000000000000000000000000000000000000000":
+        lines.append(f"  >< Skipped: hashed as {erc2362id}, not currently supported by this router.\n")
+        break
+      contract = wpf_contract(w3, addr)
+      routed = feed_config.get("isRouted", False)
+      if routed == False:
+        lastPrice, lastTimestamp, latestQueryId, pendingUpdate, witnet, bytecode = check_results(batch_rpc(w3, [
+          (contract, "lastPrice", None),
+          (contract, "lastTimestamp", None),
+          (contract, "latestQueryId", None),
+          (contract, "pendingUpdate", None),
+          (contract, "witnet", None),
+          (contract, "bytecode", None)
+        ]))
+      else:
+        lastPrice, lastTimestamp, latestQueryId = check_results(batch_rpc(w3, [
+          (contract, "lastPrice", None),
+          (contract, "lastTimestamp", None),
+          (contract, "latestQueryId", None)
+        ]))
+        pendingUpdate = False
+        witnet = None
+        bytecode = None
+      lastPrice = int(lastPrice)
+      pf = {
+        "id": erc2362id,
+        "caption": caption,
+        "decimals": int(caption.split('-')[2]),
+        "contract": contract,
+        "lastPrice": lastPrice,
+        "lastTimestamp": lastTimestamp,
+        "latestRequestId": latestQueryId,
+        "pendingUpdate": pendingUpdate,
+        "witnet": witnet,
+        "bytecode": bytecode,
+        "reverts": 0,
+        "auto_disabled": False,
+        "lastRevertedTx": "",
+        "fees": deque(maxlen=16),
+        "fees_total": 0,
+        "secs": deque(maxlen=256),
+        "secs_total": 0
+      }
+      apply_feed_config(pf, feed_config)
+      lines.append(f"  => Witnet address : {witnet}")
+      lines.append(f"  => Price feed     : {contract.address}")
+      if pf["heartbeat"] > 0:
+        lines.append(f"  => Heartbeat   : {pf['heartbeat']} seconds")
+      if pf["cooldown"] > 0:
+        lines.append(f"  => Cooldown    : {pf['cooldown']} seconds")
+      if routed == True:
+        lines.append(f"  => Deviation   : (Routed)")
+      else:
+        lines.append(f"  => Deviation   : {pf['deviation']} %")          
+      lines.append(f"  => Last price  : {lastPrice / 10 ** pf['decimals']} {pf['label']}")
+      lines.append(f"  => Last update : {datetime.datetime.fromtimestamp(lastTimestamp).strftime('%Y-%m-%d %H:%M:%S %Z')}")
+      lines.append(f"  => Latest id   : {latestQueryId} (pending: {pendingUpdate})\n")
+      break
+    except Exception as ex:
+      if attempt < 4:
+        lines.append(f"  >< Attempt #{attempt}: {ex}")
+        continue
+      else:
+        lines.append(f"  >< Skipped: Exception: {ex}")
+        break
+  return pf, lines
+
+# Poll latest update status of some price feed, given its current route and last value,
+# returning log lines
+def handle_feed(
+    w3,
+    csv_queue,
+    pfs_router,
+    pf,
+    contractAddr,
+    lastValue,
+    captionMaxLength,
+    pfs_config_file_path,
+    network_name,
+    web3_symbol,
+    web3_from,
+    web3_gas,
+    web3_gas_price,
+    web3_max_reverts,
+    web3_provider_waiting_secs,
+    web3_provider_polling_secs,
+    total_finalization_secs,
+    witnet_toolkit,
+    witnet_toolkit_timeout_secs,
+    tx_lock,
+    last_tx
+  ):
+    out = []
+    contract = pf["contract"]
+    caption = pf['caption']
+    caption += " " * (captionMaxLength - len(caption))
+
+    try:
+      # Detect eventual pricefeed updates in the router:
+      if isinstance(contractAddr, Exception):
+        raise contractAddr
+      if contract.address != contractAddr:
+        pfs_config = load_price_feeds_config(pfs_config_file_path, network_name)
+        out.append(f"{caption} <> contract route changed from {contract.address} to {contractAddr}")
+        contract = wpf_contract(w3, contractAddr)
+        pf["contract"] = contract
+        if contractAddr != "0x0000000000000000000000000000000000000000":
+          for attempt in range(5):
+            try:
+              # read from config
+              apply_feed_config(pf, pfs_config['feeds'][pf['caption']])
+              
+              # read from web3, including last value, as it was read from the previous route
+              reads = [
+                (contract, "lastPrice", None),
+                (contract, "lastTimestamp", None),
+                (contract, "latestQueryId", None),
+                (contract, "pendingUpdate", None),
+                (contract, "lastValue", None)
+              ]
+              if pf["isRouted"] == False:
+                reads.append((contract, "witnet", None))
+                reads.append((contract, "bytecode", None))
+              state = check_results(batch_rpc(w3, reads))
+              pf["lastPrice"] = int(state[0])
+              pf["lastTimestamp"] = state[1]
+              pf["latestRequestId"] = state[2]
+              pf["pendingUpdate"] = state[3]
+              lastValue = state[4]
+              if pf["isRouted"] == False:
+                pf["witnet"] = state[5]
+                pf["bytecode"] = state[6]
+
+              # reset flags
+              clear_history(pf, "fees")
+              clear_history(pf, "secs")
+              pf["auto_disabled"] = False
+              pf["lastRevertedTx"] = ""
+              pf["reverts"] = 0
+              break
+            except Exception as ex:
+              if attempt < 4:
+                out.append(f"{caption} >< refreshing contract state attempt #{attempt}: {ex}")
+                time.sleep(1)
+              else:
+                raise ex
+
+      if contractAddr == "0x0000000000000000000000000000000000000000":
+        # Nothing to do if router stopped supporting this pricefeed
+        return out
+
+      if pf["auto_disabled"]:
+        # Skip if this pricefeed is disabled
+        out.append(f"{caption} >< too many reverts: see last reverted tx: {pf['lastRevertedTx']}")
+        return out
+
+      if isinstance(lastValue, Exception):
+        raise lastValue
+      status = lastValue[3]
+      current_ts = int(time.time())
+      elapsed_secs = current_ts - pf["lastTimestamp"]
+    
+      # If still waiting for an update...
+      if pf["pendingUpdate"] == True:
+      
+        # A new valid result has just been detected:
+        if status == 200 and lastValue[1] > pf["lastTimestamp"]:
+          pf["pendingUpdate"] = False
+          pf["lastPrice"] = lastValue[0]
+          elapsed_secs = lastValue[1] - pf["lastTimestamp"] 
+          pf["lastTimestamp"] = lastValue[1]
+          out.append(f"{caption} << drTxHash: {lastValue[2].hex()}, lastPrice updated to {lastValue[0]}, after {elapsed_secs} secs")
+          
+        # An invalid result has just been detected:
+        elif status == 400:
+          pf["pendingUpdate"] = False
+          latestDrTxHash, latestError = check_results(batch_rpc(w3, [
+            (contract, "latestUpdateDrTxHash", None),
+            (contract, "latestUpdateErrorMessage", None)
+          ]))
+          out.append(f"{caption} >< drTxHash: {latestDrTxHash.hex()}, latestError: \"{str(latestError)}\", after {elapsed_secs} secs")
+
+        else:
+          out.append(f"{caption} .. contract {contract.address} awaits response from {pf['witnet']}::{pf['latestRequestId']}")
+          
+      # If no update is pending:
+      else :
+        
+        if elapsed_secs >= pf["cooldown"] - total_finalization_secs:
+          last_price = pf["lastPrice"]
+          deviation = 0
+
+          if pf["heartbeat"] == 0:
+            # No heartbeat, no polling.                
+            # But still, watch for external updates on unmanaged routed price feeds could still be traced:                  
+            pf["pendingUpdate"] = raw_call(w3, contract, "pendingUpdate")
+            if pf["pendingUpdate"]:
+              out.append(f"{caption} <> detected routed update on contract {contract.address}")
+            else:
+              out.append(f"{caption} .. no routed update detected on contract {contract.address}")
+            return out
+
+          elif elapsed_secs >= pf["heartbeat"] - (0 if pf["isRouted"] else total_finalization_secs):
+            # Otherwise, check heartbeat condition, first:
+            reason = f"of heartbeat and Witnet latency"
+
+          elif pf['isRouted'] == False and pf['deviation'] > 0 and last_price > 0:                
+            # If heartbeat condition is not met yet, then check for deviation, if required:
+            try:
+              next_price = dry_run_request(
+                witnet_toolkit,
+                pf["bytecode"],
+                witnet_toolkit_timeout_secs
+              )
+            except Exception as ex:
+              # ...if dry run fails, assume 0 deviation as to, at least, guarantee the heartbeat periodicity is met
+              out.append(f"{caption} >< Dry-run failed: {ex}")
+              return out
+            deviation = round(100 * ((next_price - last_price) / last_price), 2)
+            
+            # If deviation is below threshold...
+            if abs(deviation) < pf["deviation"]:
+              # ...skip request update until, at least, another `loop_interval_secs` secs
+              out.append(f"{caption} .. {deviation} % deviation after {elapsed_secs} secs since last update")                  
+              return out
+            else:
+              reason = f"deviation is greater than {pf['deviation']} %"
+
+          else:
+            external_update = False
+            if pf['isRouted'] == True:
+              # Check for update signalling on cached-routed price feeds                
+              external_update = raw_call(w3, contract, "pendingUpdate")
+              
+            if external_update:
+              reason = f"a routed update was detected"
+            else:
+              out.append(f"{caption} .. awaiting routed update, or heartbeat condition, for another {pf['heartbeat'] - elapsed_secs} secs")
+              return out
+            
+          out.append(f"{caption} >> Requesting update after {elapsed_secs} seconds because {reason}:")
+          # transactions are sent from the same account, so one at a time
+          with tx_lock:
+            result = handle_requestUpdate(
+              w3,
+              csv_queue,
+              pfs_router,
+              contract,
+              pf['isRouted'],
+              pf['latestRequestId'],
+              web3_symbol,
+              web3_from,
+              web3_gas,
+              web3_gas_price,
+              web3_provider_waiting_secs,
+              web3_provider_polling_secs,
+              last_tx,
+              out
+            )
+
+            # on fully successfull update request, update fees history, to be settled on next balance read
+            if len(result) >= 3 and result[2] > 0:
+              push_history(pf, "fees", result[2])
+              last_tx.update(pf=pf, balance=result[3], fee=result[2])
+          latestRequestId = result[0]
+          if latestRequestId > 0:
+            pf["latestRequestId"] = latestRequestId
+            pf["pendingUpdate"] = True
+            pf["reverts"] = 0
+
+          elif latestRequestId < 0:
+            pf["lastRevertedTx"] = result[1]
+            pf["reverts"] = pf["reverts"] + 1
+            if pf["reverts"] >= web3_max_reverts:
+              pf["auto_disabled"] = True
+
+          # on fully successfull update request:
+          if len(result) >= 3:                
+
+            # update secs history
+            push_history(pf, "secs", elapsed_secs)
+
+            # and in case of routed priced, update lastTimestamp immediately
+            if pf["isRouted"]:
+              lastValue = raw_call(w3, contract, "lastValue")
+              pf["lastTimestamp"] = lastValue[1]
+              out.append(f" <<<< lastPrice was {lastValue[0]}, {int(time.time()) - lastValue[1]} secs ago")
+
+        else:
+          secs_until_next_check = pf['cooldown'] - elapsed_secs - total_finalization_secs
+          if secs_until_next_check > 0:
+            out.append(f"{caption} .. resting for another {secs_until_next_check} secs before next triggering check")
+    
+    # Capture exceptions while reading state from contract
+    except Exception as ex:
+      out.append(f"{caption} .. Exception when getting state from contract {contract.address}: {ex}")
+    return out
+
 def log_loop(
     w3,
     loop_interval_secs,
-    csv_filename,
+    csv_queue,
     pfs_config_file_path,
     network_name,
     web3_symbol,
@@ -208,7 +744,9 @@ def log_loop(
     web3_provider_waiting_secs,
     web3_provider_polling_secs,
     witnet_resolution_secs,
-    witnet_toolkit_timeout_secs
+    witnet_toolkit_timeout_secs,
+    route_check_interval,
+    multicall3_address
   ):
     pfs_config = load_price_feeds_config(pfs_config_file_path, network_name)
     pfs_router = wpr_contract(w3, pfs_config['address'])
@@ -216,295 +754,125 @@ def log_loop(
       print("Fatal: no WitnetPriceRouter address")
       exit(1)
     print(f"\nUsing WitnetPriceRouter at {pfs_router.address}:\n")
+
+    witnet_toolkit = witnet_toolkit_cmdline()
+
+    # Aggregate polling reads into one single call, if Multicall3 is available
+    multicall = None
+    if multicall3_address:
+      try:
+        if len(w3.eth.get_code(multicall3_address)) > 0:
+          multicall = multicall3_contract(w3, multicall3_address)
+          print(f"Using Multicall3 at {multicall.address}\n")
+      except Exception as ex:
+        print(f"Multicall3 not available at {multicall3_address}: {ex}\n")
     
-    captionMaxLength = 0
-    pfs = []    
-    for caption in pfs_config['feeds']:
-      erc2362id = pfs_router.functions.currencyPairId(caption).call().hex()
-      if pfs_router.functions.supportsCurrencyPair(erc2362id).call():
-        print(f"{caption}:")
-        for attempt in range(5):
-          try:
-            addr = pfs_router.functions.getPriceFeed(erc2362id).call()
-            if addr == "0x0000000000000000000000000000000000000000":
-              print(f"  >< Skipped: not currently supported by this router.")
-              break
-            contract = wpf_contract(w3, addr)
-            cooldown = pfs_config['feeds'][caption].get("minSecsBetweenUpdates", 0)
-            deviation = pfs_config['feeds'][caption].get("deviationPercentage", 0.0)
-            heartbeat = int(pfs_config['feeds'][caption].get("maxSecsBetweenUpdates", 0))
-            routed = pfs_config['feeds'][caption].get("isRouted", False)
-            lastPrice = int(contract.functions.lastPrice().call())
-            lastTimestamp = contract.functions.lastTimestamp().call()
-            latestQueryId = contract.functions.latestQueryId().call()
-            if routed == False:
-              pendingUpdate = contract.functions.pendingUpdate().call()
-              witnet = contract.functions.witnet().call()
-            else:
-              pendingUpdate = False
-              witnet = None
-            pfs.append({
-              "id": erc2362id,
-              "caption": caption,
-              "contract": contract,
-              "deviation": deviation,
-              "heartbeat": heartbeat,
-              "isRouted": routed,
-              "lastPrice": lastPrice,
-              "lastTimestamp": lastTimestamp,
-              "latestRequestId": latestQueryId,
-              "cooldown": cooldown,
-              "pendingUpdate": pendingUpdate,
-              "witnet": witnet,
-              "reverts": 0,
-              "auto_disabled": False,
-              "lastRevertedTx": "",
-              "fees": [],
-              "secs": []
-            })
-            print(f"  => Witnet address : {witnet}")
-            print(f"  => Price feed     : {contract.address}")
-            if heartbeat > 0:
-              print(f"  => Heartbeat   : {heartbeat} seconds")
-            if cooldown > 0:
-              print(f"  => Cooldown    : {cooldown} seconds")
-            if routed == True:
-              print(f"  => Deviation   : (Routed)")
-            else:
-              print(f"  => Deviation   : {deviation} %")          
-            print(f"  => Last price  : {lastPrice / 10 ** int(caption.split('-')[2])} {pfs_config['feeds'][caption]['label']}")
-            print(f"  => Last update : {datetime.datetime.fromtimestamp(lastTimestamp).strftime('%Y-%m-%d %H:%M:%S %Z')}")
-            print(f"  => Latest id   : {latestQueryId} (pending: {pendingUpdate})\n")
-            break
-          except Exception as ex:
-            if attempt < 4:
-              print(f"  >< Attempt #{attempt}: {ex}")
-              continue
-            else:
-              print(f"  >< Skipped: Exception: {ex}")
-              break
-        
-        if len(caption) > captionMaxLength:
-          captionMaxLength = len(caption)
+    # Price feeds are probed and polled in parallel, but logged in order
+    pool = ThreadPoolExecutor(max_workers=16)
+    tx_lock = threading.Lock()
+    last_tx = {}
 
-      else:
-        print(f"{caption} => hashed as {erc2362id}, not found in the registry :/\n")
+    probes = pool.map(
+      lambda caption: probe_feed(w3, pfs_router, pfs_config['feeds'][caption], caption),
+      pfs_config['feeds']
+    )
+    pfs = []
+    for pf, lines in probes:
+      for line in lines:
+        print(line)
+      if pf is not None:
+        pfs.append(pf)
+    captionMaxLength = max([ len(pf["caption"]) for pf in pfs ], default=0)
 
     if len(pfs) == 0:
       print("Sorry, no price feeds to poll :/")
       return
 
     print(f"Ok, so let's poll every {loop_interval_secs} seconds...")
-    low_balance_ts = int(time.time()) - 900
+    low_balance_ts = time.monotonic() - 900
     total_finalization_secs = web3_finalization_secs + witnet_resolution_secs
+    loop_counter = 0
     while True:
-      print()
-      loop_ts = int(time.time())
-      
-      balance = w3.eth.getBalance(web3_from)
-      time_left_secs = time_to_die_secs(balance, pfs)
-      if time_left_secs > 0:
-        if time_left_secs <= 86400 * 3 and (loop_ts - low_balance_ts) >= 900:
-          # start warning every 900 seconds if estimated time before draiing funds is less than 3 days
-          low_balance_ts = loop_ts
-          print(f"LOW FUNDS !!!: estimated {round(time_left_secs / 3600, 2)} hours before running out of funds")
-        else:
-          print(f"Time-To-Die: {round(time_left_secs / 3600, 2)} hours")
+      # Log lines of every loop get written all at once
+      out = [ "" ]
+      loop_ts = time.monotonic()
 
+      # Routes change only on rare admin txs, so check them every `route_check_interval` loops
+      check_routes = loop_counter % route_check_interval == 0
+      loop_counter += 1
+      
+      # Read master balance, current routes (if required) and last values of all price feeds, at once
+      if multicall is not None:
+        reads = [ (multicall, "getEthBalance", [ web3_from ]) ]
+      else:
+        reads = [ (None, "eth_getBalance", [ web3_from, "latest" ]) ]
       for pf in pfs:
-        
-        contract = pf["contract"]
-        caption = pf['caption']
-        caption += " " * (captionMaxLength - len(caption))
+        if check_routes:
+          reads.append((pfs_router, "getPriceFeed", [ pf["id"] ]))
+        reads.append((pf["contract"], "lastValue", None))
+      try:
+        if multicall is not None:
+          results = multicall_rpc(w3, multicall, reads)
+        else:
+          results = batch_rpc(w3, reads)
+      except Exception as ex:
+        results = [ ex ] * len(reads)
 
-        # Poll latest update status
-        try:
-          # Detect eventual pricefeed updates in the router:
-          contractAddr = pfs_router.functions.getPriceFeed(pf["id"]).call()
-          if contract.address != contractAddr:
-            pfs_config = load_price_feeds_config(pfs_config_file_path, network_name)
-            print(f"{caption} <> contract route changed from {contract.address} to {contractAddr}")
-            contract = wpf_contract(w3, contractAddr)
-            pf["contract"] = contract
-            if contractAddr != "0x0000000000000000000000000000000000000000":
-              for attempt in range(5):
-                try:
-                  # read from config
-                  pf["cooldown"] = int(pfs_config['feeds'][pf['caption']].get("minSecsBetweenUpdates", 0))
-                  pf["deviation"] = pfs_config['feeds'][pf['caption']].get("deviationPercentage", 0.0)
-                  pf["heartbeat"] = int(pfs_config['feeds'][pf['caption']].get("maxSecsBetweenUpdates", 0))
-                  pf["isRouted"] = pfs_config['feeds'][pf['caption']].get("isRouted", False)
-                  
-                  # read from web3
-                  if pf["isRouted"] == False:
-                    pf["witnet"] = contract.functions.witnet().call()
-                  pf["lastPrice"] = int(contract.functions.lastPrice().call())
-                  pf["lastTimestamp"] = contract.functions.lastTimestamp().call()
-                  pf["latestQueryId"] = contract.functions.latestQueryId().call()
-                  pf["pendingUpdate"] = contract.functions.pendingUpdate().call()
-
-                  # reset flags
-                  pf["fees"].clear()
-                  pf["secs"].clear()
-                  pf["auto_disabled"] = False
-                  pf["lastRevertedTx"] = ""
-                  pf["reverts"] = 0
-                  break
-                except Exception as ex:
-                  if attempt < 4:
-                    print(f"{caption} >< refreshing contract state attempt #{attempt}: {ex}")
-                    time.sleep(1)
-                  else:
-                    raise ex
-
-          if contractAddr == "0x0000000000000000000000000000000000000000":
-            # Nothing to do if router stopped supporting this pricefeed
-            continue
-
-          if pf["auto_disabled"]:
-            # Skip if this pricefeed is disabled
-            print(f"{caption} >< too many reverts: see last reverted tx: {pf['lastRevertedTx']}")
-            continue
-
-          lastValue = contract.functions.lastValue().call()
-          status = lastValue[3]
-          current_ts = int(time.time())
-          elapsed_secs = current_ts - pf["lastTimestamp"]
-        
-          # If still waiting for an update...
-          if pf["pendingUpdate"] == True:
-          
-            # A new valid result has just been detected:
-            if status == 200 and lastValue[1] > pf["lastTimestamp"]:
-              pf["pendingUpdate"] = False
-              pf["lastPrice"] = lastValue[0]
-              elapsed_secs = lastValue[1] - pf["lastTimestamp"] 
-              pf["lastTimestamp"] = lastValue[1]
-              print(f"{caption} << drTxHash: {lastValue[2].hex()}, lastPrice updated to {lastValue[0]}, after {elapsed_secs} secs")
-              
-            # An invalid result has just been detected:
-            elif status == 400:
-              pf["pendingUpdate"] = False
-              latestDrTxHash = contract.functions.latestUpdateDrTxHash().call()
-              latestError = contract.functions.latestUpdateErrorMessage().call()
-              print(f"{caption} >< drTxHash: {latestDrTxHash.hex()}, latestError: \"{str(latestError)}\", after {elapsed_secs} secs")
+      if isinstance(results[0], Exception):
+        out.append(f"Exception when getting balance of {web3_from}: {results[0]}")
+      else:
+        balance = results[0] if multicall is not None else Web3.toInt(hexstr=results[0])
+        log_settled_fee(settle_last_fee(last_tx, balance), web3_symbol, out)
+        time_left_secs = time_to_die_secs(balance, pfs)
+        if time_left_secs > 0:
+          if time_left_secs <= 86400 * 3 and (loop_ts - low_balance_ts) >= 900:
+            # start warning every 900 seconds if estimated time before draiing funds is less than 3 days
+            low_balance_ts = loop_ts
+            out.append(f"LOW FUNDS !!!: estimated {round(time_left_secs / 3600, 2)} hours before running out of funds")
+          else:
+            out.append(f"Time-To-Die: {round(time_left_secs / 3600, 2)} hours")
 
-            else:
-              print(f"{caption} .. contract {contract.address} awaits response from {pf['witnet']}::{pf['latestRequestId']}")
-              
-          # If no update is pending:
-          else :
-            
-            if elapsed_secs >= pf["cooldown"] - total_finalization_secs:
-              last_price = pf["lastPrice"]
-              deviation = 0
-
-              if pf["heartbeat"] == 0:
-                # No heartbeat, no polling.                
-                # But still, watch for external updates on unmanaged routed price feeds could still be traced:                  
-                pf["pendingUpdate"] = contract.functions.pendingUpdate().call()
-                if pf["pendingUpdate"]:
-                  print(f"{caption} <> detected routed update on contract {contract.address}")
-                else:
-                  print(f"{caption} .. no routed update detected on contract {contract.address}")
-                continue
-
-              elif elapsed_secs >= pf["heartbeat"] - (0 if pf["isRouted"] else total_finalization_secs):
-                # Otherwise, check heartbeat condition, first:
-                reason = f"of heartbeat and Witnet latency"
-
-              elif pf['isRouted'] == False and pf['deviation'] > 0 and last_price > 0:                
-                # If heartbeat condition is not met yet, then check for deviation, if required:
-                try:
-                  next_price = dry_run_request(
-                    contract.functions.bytecode().call(),
-                    witnet_toolkit_timeout_secs
-                  )
-                except Exception as ex:
-                  # ...if dry run fails, assume 0 deviation as to, at least, guarantee the heartbeat periodicity is met
-                  print(f"{caption} >< Dry-run failed:", ex)
-                  continue
-                deviation = round(100 * ((next_price - last_price) / last_price), 2)
-                
-                # If deviation is below threshold...
-                if abs(deviation) < pf["deviation"]:
-                  # ...skip request update until, at least, another `loop_interval_secs` secs
-                  print(f"{caption} .. {deviation} % deviation after {elapsed_secs} secs since last update")                  
-                  continue
-                else:
-                  reason = f"deviation is greater than {pf['deviation']} %"
+      # Handle all price feeds concurrently, but log them in order
+      flush_lines(out)
+      feeds = []
+      for index, pf in enumerate(pfs):
+        if check_routes:
+          feeds.append((pf, results[1 + 2 * index], results[2 + 2 * index]))
+        else:
+          feeds.append((pf, pf["contract"].address, results[1 + index]))
+      handled = pool.map(
+        lambda feed: handle_feed(
+          w3,
+          csv_queue,
+          pfs_router,
+          *feed,
+          captionMaxLength,
+          pfs_config_file_path,
+          network_name,
+          web3_symbol,
+          web3_from,
+          web3_gas,
+          web3_gas_price,
+          web3_max_reverts,
+          web3_provider_waiting_secs,
+          web3_provider_polling_secs,
+          total_finalization_secs,
+          witnet_toolkit,
+          witnet_toolkit_timeout_secs,
+          tx_lock,
+          last_tx
+        ),
+        feeds
+      )
+      for lines in handled:
+        out += lines
 
-              else:
-                external_update = False
-                if pf['isRouted'] == True:
-                  # Check for update signalling on cached-routed price feeds                
-                  external_update = contract.functions.pendingUpdate().call()
-                  
-                if external_update:
-                  reason = f"a routed update was detected"
-                else:
-                  print(f"{caption} .. awaiting routed update, or heartbeat condition, for another {pf['heartbeat'] - elapsed_secs} secs")
-                  continue
-                
-              print(f"{caption} >> Requesting update after {elapsed_secs} seconds because {reason}:")
-              result = handle_requestUpdate(
-                w3,
-                csv_filename,
-                pfs_router,
-                contract,
-                pf['isRouted'],
-                pf['latestRequestId'],
-                web3_symbol,
-                web3_from,
-                web3_gas,
-                web3_gas_price,
-                web3_provider_waiting_secs,
-                web3_provider_polling_secs
-              )
-              latestRequestId = result[0]
-              if latestRequestId > 0:
-                pf["latestRequestId"] = latestRequestId
-                pf["pendingUpdate"] = True
-                pf["reverts"] = 0
-
-              elif latestRequestId < 0:
-                pf["lastRevertedTx"] = result[1]
-                pf["reverts"] = pf["reverts"] + 1
-                if pf["reverts"] >= web3_max_reverts:
-                  pf["auto_disabled"] = True
-
-              # on fully successfull update request:
-              if len(result) >= 3:                
-
-                # update fees and secs history
-                latestFee = result[2]
-                if latestFee > 0:
-                  pf["fees"].append(latestFee)
-                  if len(pf["fees"]) > 16:
-                    del pf["fees"][0]
-                pf["secs"].append(elapsed_secs)                
-                if len(pf["secs"]) > 256:
-                  del pf["secs"][0]
-
-                # and in case of routed priced, update lastTimestamp immediately
-                if pf["isRouted"]:
-                  lastValue = contract.functions.lastValue().call()
-                  pf["lastTimestamp"] = lastValue[1]
-                  print(f" <<<< lastPrice was {lastValue[0]}, {int(time.time()) - lastValue[1]} secs ago")
+      flush_lines(out)
 
-            else:
-              secs_until_next_check = pf['cooldown'] - elapsed_secs - total_finalization_secs
-              if secs_until_next_check > 0:
-                print(f"{caption} .. resting for another {secs_until_next_check} secs before next triggering check")
-        
-        # Capture exceptions while reading state from contract
-        except Exception as ex:
-          print(f"{caption} .. Exception when getting state from contract {contract.address}: {ex}")
-      
       # Sleep just enough between loops
-      preemptive_secs = loop_interval_secs - int(time.time()) + loop_ts
-      if preemptive_secs > 0:
-        time.sleep(preemptive_secs)
+      sleep_secs = loop_interval_secs - (time.monotonic() - loop_ts)
+      if sleep_secs > 0:
+        time.sleep(sleep_secs)
 
 def main(args):    
     print("================================================================================")
@@ -521,21 +889,28 @@ def main(args):
     web3_gas = int(os.getenv('WPFP_WEB3_GAS')) if os.getenv('WPFP_WEB3_GAS') else None
     web3_gas_price = int(os.getenv('WPFP_WEB3_GAS_PRICE')) if os.getenv('WPFP_WEB3_GAS_PRICE') else None
     web3_max_reverts = int(os.getenv('WPFP_WEB3_MAX_REVERTS') or 3)
+    web3_multicall3_address = os.getenv('WPFP_WEB3_MULTICALL3_ADDRESS', "0xcA11bde05977b3631167028862bE2a173976CA11")
     web3_provider = args.provider if args.provider else os.getenv('WPFP_WEB3_PROVIDER')
     web3_provider_poa = bool(os.getenv('WPFP_WEB3_PROVIDER_POA'))
-    web3_provider_waiting_secs = int(os.getenv('WPFP_WEB3_PROVIDER_WAITING_TIMEOUT_SECS') or 130)
-    web3_provider_polling_secs = int(os.getenv('WPFP_WEB3_PROVIDER_POLLING_LATENCY_SECS') or 13)
+    web3_provider_waiting_secs = args.waiting_timeout_secs or int(os.getenv('WPFP_WEB3_PROVIDER_WAITING_TIMEOUT_SECS') or 60)
+    web3_provider_polling_secs = args.polling_latency_secs or int(os.getenv('WPFP_WEB3_PROVIDER_POLLING_LATENCY_SECS') or 1)
     web3_symbol = os.getenv('WPFP_WEB3_SYMBOL') or "ETH"
 
     # Read witnet parameters from environment:
     witnet_resolution_secs = int(os.getenv('WPFP_WITNET_RESOLUTION_SECS') or 300)
     witnet_toolkit_timeout_secs = int(os.getenv('WPFP_WITNET_TOOLKIT_TIMEOUT_SECS') or 15)
 
+    # Read router parameters from environment:
+    route_check_interval = max(1, int(os.getenv('WPFP_ROUTE_CHECK_INTERVAL') or 60))
+
     # Echo timers set-up:
     print(f"Loop interval period  : {'{:,}'.format(args.loop_interval_secs)}\"")
     print(f"Web3 finalization time: {'{:,}'.format(web3_finalization_secs)}\"")
+    print(f"Web3 receipt timeout  : {'{:,}'.format(web3_provider_waiting_secs)}\"")
+    print(f"Web3 receipt polling  : {'{:,}'.format(web3_provider_polling_secs)}\"")
     print(f"Witnet resolution time: {'{:,}'.format(witnet_resolution_secs)}\"")
     print(f"Witnet toolkit timeout: {'{:,}'.format(witnet_toolkit_timeout_secs)}\"")
+    print(f"Route check interval  : {'{:,}'.format(route_check_interval)} loops")
 
     # Read pricefeeds config path, and config itself:
     config_path = args.json_path if args.json_path else os.getenv('WPFP_CONFIG_PATH')
@@ -546,10 +921,19 @@ def main(args):
       print(f"Fatal: no configuration available for network '{network_name}'")
       exit(1)
     
-    # Create Web3 object
+    # Create Web3 object, on top of a keep-alive HTTP session
+    session = requests.Session()
+    adapter = HTTPAdapter(
+      pool_connections=32,
+      pool_maxsize=32,
+      max_retries=Retry(total=3, backoff_factor=0.2)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
     w3 = Web3(Web3.HTTPProvider(
       web3_provider,
-      request_kwargs={'timeout': network_timeout_secs}
+      request_kwargs={'timeout': network_timeout_secs},
+      session=session
     ))
 
     # Inject POA middleware, if necessary
@@ -583,7 +967,6 @@ def main(args):
       
       # If no `gas_price` value is specified at all, try to activate general RPC gas price strategy:
       elif web3_gas_price is None:
-        from web3.gas_strategies.rpc import rpc_gas_price_strategy
         w3.eth.set_gas_price_strategy(rpc_gas_price_strategy)
         print("Gas price strategy: eth_gasPrice")
 
@@ -610,11 +993,14 @@ def main(args):
     except Exception as ex:
       print(f"RPC provider does not support web3_clientVersion method.")
 
+    # Start logging master balance into CSV file, if any
+    csv_queue = start_csv_writer(args.csv_file) if args.csv_file else None
+
     # Enter infinite loop
     log_loop(
       w3,
       args.loop_interval_secs,
-      args.csv_file,
+      csv_queue,
       config_path,
       network_name,
       web3_symbol,
@@ -626,7 +1012,9 @@ def main(args):
       web3_provider_waiting_secs,
       web3_provider_polling_secs,
       witnet_resolution_secs,
-      witnet_toolkit_timeout_secs
+      witnet_toolkit_timeout_secs,
+      route_check_interval,
+      web3_multicall3_address
     )
 
 if __name__ == '__main__':
@@ -637,6 +1025,10 @@ if __name__ == '__main__':
                     help='seconds after which the script triggers the state of the smart contract')
     parser.add_argument('--provider', dest='provider', action='store', required=False,
                     help='web3 provider to which the poller should connect. If not provided it reads from config')
+    parser.add_argument('--waiting_timeout_secs', dest='waiting_timeout_secs', action='store', type=int, required=False,
+                    help='seconds to wait for a transaction receipt. If not provided it reads from config')
+    parser.add_argument('--polling_latency_secs', dest='polling_latency_secs', action='store', type=int, required=False,
+                    help='seconds between polls while waiting for a transaction receipt. If not provided it reads from config')
     parser.add_argument('--csv_file', dest='csv_file', action='store', required=False, default="",
                     help='provide the CSV file in which master address balance will be logged after sending every new transaction')
 